@@ -9,6 +9,28 @@ DEVELOPMENT_DB_PATH = "todos_development.sqlite"
 TEST_DB_PATH = os.path.join(tempfile.gettempdir(), "todos_test.sqlite")
 PRODUCTION_DB_PATH = "todos_production.sqlite"
 
+# SQLite pragmas applied on every connection: WAL lets readers run during a
+# write and NORMAL sync only fsyncs at checkpoints instead of on every commit
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -64000,  # 64MB page cache
+    "foreign_keys": 1,
+    "mmap_size": 268435456,  # 256MB
+    "temp_store": "memory",
+}
+# Test databases are thrown away, so they skip fsync entirely
+TEST_SQLITE_PRAGMAS = {**SQLITE_PRAGMAS, "synchronous": "off"}
+
+# Connection pool - pooled connections keep their pragmas across requests
+DATABASE_MAX_CONNECTIONS = 32
+DATABASE_STALE_TIMEOUT = 300  # seconds before an idle connection is recycled
+DATABASE_POOL_TIMEOUT = 10  # seconds to wait for a free connection
+
+# Threadpool running the blocking database calls - one thread per pooled
+# connection, so a worker never sits waiting on the pool
+THREADPOOL_SIZE = DATABASE_MAX_CONNECTIONS
+
 # Server configuration
 DEVELOPMENT_HOST = "0.0.0.0"
 DEVELOPMENT_PORT = 8000
@@ -17,30 +39,73 @@ TEST_PORT = 8001
 PRODUCTION_HOST = "0.0.0.0"
 PRODUCTION_PORT = 8000
 
+# Uvicorn workers, event loop and HTTP parser ("auto" picks uvloop/httptools
+# when installed; production pins them so a missing extra fails loudly)
+DEVELOPMENT_WORKERS = 1
+TEST_WORKERS = 1
+PRODUCTION_WORKERS = os.cpu_count() or 2
+DEVELOPMENT_LOOP = "auto"
+TEST_LOOP = "auto"
+PRODUCTION_LOOP = "uvloop"
+DEVELOPMENT_HTTP = "auto"
+TEST_HTTP = "auto"
+PRODUCTION_HTTP = "httptools"
+
 # CORS origins
 DEVELOPMENT_ORIGINS = ["http://localhost:5173", "http://localhost:5174", "http://localhost:3000"]
 TEST_ORIGINS = ["http://localhost:5175"]
 PRODUCTION_ORIGINS = []  # Should be configured for production
 
+# Response cache - seconds a serialized GET /api/todos response stays valid,
+# and the age after which hits trigger a background refresh
+RESPONSE_CACHE_TTL = 30
+RESPONSE_CACHE_STALE_AFTER = 5
+RESPONSE_CACHE_MAX_ENTRIES = 256  # one per cached path: the list plus single todos
+
 # Environment-based configuration
 if APP_ENV == "test":
     DATABASE_PATH = TEST_DB_PATH
+    DATABASE_PRAGMAS = TEST_SQLITE_PRAGMAS
     SERVER_HOST = TEST_HOST
     SERVER_PORT = TEST_PORT
+    WORKERS = TEST_WORKERS
+    UVICORN_LOOP = TEST_LOOP
+    UVICORN_HTTP = TEST_HTTP
     CORS_ORIGINS = TEST_ORIGINS
     APP_TITLE = "Todo API - Test"
     RELOAD = False
+    CREATE_TABLES_ON_STARTUP = True
+    ENABLE_BULK_DELETE = True  # lets the e2e suite reset state in one request
 elif APP_ENV == "production":
     DATABASE_PATH = PRODUCTION_DB_PATH
+    DATABASE_PRAGMAS = SQLITE_PRAGMAS
     SERVER_HOST = PRODUCTION_HOST
     SERVER_PORT = PRODUCTION_PORT
+    WORKERS = PRODUCTION_WORKERS
+    UVICORN_LOOP = PRODUCTION_LOOP
+    UVICORN_HTTP = PRODUCTION_HTTP
     CORS_ORIGINS = PRODUCTION_ORIGINS
     APP_TITLE = "Todo API - Production"
     RELOAD = False
+    CREATE_TABLES_ON_STARTUP = False  # run init_db.py once per deploy instead
+    ENABLE_BULK_DELETE = False
 else:  # Default to development
     DATABASE_PATH = DEVELOPMENT_DB_PATH
+    DATABASE_PRAGMAS = SQLITE_PRAGMAS
     SERVER_HOST = DEVELOPMENT_HOST
     SERVER_PORT = DEVELOPMENT_PORT
+    WORKERS = DEVELOPMENT_WORKERS
+    UVICORN_LOOP = DEVELOPMENT_LOOP
+    UVICORN_HTTP = DEVELOPMENT_HTTP
     CORS_ORIGINS = DEVELOPMENT_ORIGINS
     APP_TITLE = "Todo API"
     RELOAD = True
+    CREATE_TABLES_ON_STARTUP = True
+    ENABLE_BULK_DELETE = False
+
+# Process-level overrides: docker-compose points DATABASE_PATH at its volume,
+# and the e2e suite gives each parallel worker its own database, port and origin
+DATABASE_PATH = os.getenv("DATABASE_PATH", DATABASE_PATH)
+SERVER_PORT = int(os.getenv("SERVER_PORT", SERVER_PORT))
+if os.getenv("CORS_ORIGINS"):
+    CORS_ORIGINS = os.environ["CORS_ORIGINS"].split(",")
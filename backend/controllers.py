@@ -1,13 +1,13 @@
-from fastapi import HTTPException
 from typing import List
 
 from schemas import TodoResponse, TodoCreate, TodoUpdate
 from services import TodoService
-from repositories import TodoNotFoundException
 
 
 class TodoController:
-    """Controller class for todo API endpoints"""
+    """Controller class for todo API endpoints - not-found errors propagate to main.py's handler"""
+
+    __slots__ = ("service",)
 
     def __init__(self):
         self.service = TodoService()
@@ -16,12 +16,13 @@ class TodoController:
         """Get all todos"""
         return self.service.get_all_todos()
 
+    def get_all_todos_json(self) -> bytes:
+        """Get all todos as a JSON array"""
+        return self.service.get_all_todos_json()
+
     def get_todo(self, todo_id: int) -> TodoResponse:
         """Get a specific todo by ID"""
-        try:
-            return self.service.get_todo_by_id(todo_id)
-        except TodoNotFoundException as e:
-            raise HTTPException(status_code=404, detail=str(e))
+        return self.service.get_todo_by_id(todo_id)
 
     def create_todo(self, todo: TodoCreate) -> TodoResponse:
         """Create a new todo"""
@@ -29,21 +30,16 @@ class TodoController:
 
     def update_todo(self, todo_id: int, update: TodoUpdate) -> TodoResponse:
         """Update a todo's details"""
-        try:
-            return self.service.update_todo(todo_id, update)
-        except TodoNotFoundException as e:
-            raise HTTPException(status_code=404, detail=str(e))
+        return self.service.update_todo(todo_id, update)
 
     def toggle_todo_completion(self, todo_id: int) -> TodoResponse:
         """Toggle a todo's completion status"""
-        try:
-            return self.service.toggle_todo_completion(todo_id)
-        except TodoNotFoundException as e:
-            raise HTTPException(status_code=404, detail=str(e))
+        return self.service.toggle_todo_completion(todo_id)
 
     def delete_todo(self, todo_id: int) -> dict:
         """Delete a todo"""
-        try:
-            return self.service.delete_todo(todo_id)
-        except TodoNotFoundException as e:
-            raise HTTPException(status_code=404, detail=str(e))
+        return self.service.delete_todo(todo_id)
+
+    def delete_all_todos(self) -> dict:
+        """Delete all todos"""
+        return self.service.delete_all_todos()
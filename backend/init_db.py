@@ -0,0 +1,12 @@
+"""
+Create the database schema for the current APP_ENV.
+Production servers don't create tables on startup, run this once per deploy:
+    APP_ENV=production python init_db.py
+"""
+from models import db, create_tables
+from config.environment import APP_ENV, DATABASE_PATH
+
+if __name__ == "__main__":
+    with db.connection_context():
+        create_tables()
+    print(f"Schema ready for '{APP_ENV}' at {DATABASE_PATH}")
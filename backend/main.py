@@ -1,31 +1,64 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+import anyio
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 from typing import List
 
-from models import db, Todo
+from models import db, create_tables
 from schemas import TodoResponse, TodoCreate, TodoUpdate
 from controllers import TodoController
-from config.environment import APP_TITLE, CORS_ORIGINS, SERVER_HOST, SERVER_PORT, RELOAD
+from repositories import TodoNotFoundException
+from middleware import FastCORSMiddleware, ResponseCache, ResponseCacheMiddleware
+from config.environment import (
+    APP_TITLE, CORS_ORIGINS, SERVER_HOST, SERVER_PORT, RELOAD,
+    RESPONSE_CACHE_TTL, RESPONSE_CACHE_STALE_AFTER, RESPONSE_CACHE_MAX_ENTRIES,
+    WORKERS, UVICORN_LOOP, UVICORN_HTTP, CREATE_TABLES_ON_STARTUP, THREADPOOL_SIZE,
+    ENABLE_BULK_DELETE,
+)
+
+# Serialized GET responses, dropped on every write to the todos API
+response_cache = ResponseCache(
+    ttl=RESPONSE_CACHE_TTL,
+    stale_after=RESPONSE_CACHE_STALE_AFTER,
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+)
 
 # Get database from models
 def get_database():
     return db
 
+def _with_connection(func, *args):
+    """Call func on a pooled connection checked out and returned by this thread"""
+    with db.connection_context():
+        return func(*args)
+
+async def run_db(func, *args):
+    """Run a blocking controller call in the threadpool on a pooled connection"""
+    return await run_in_threadpool(_with_connection, func, *args)
+
 # Lifespan context manager for database
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
     current_db = get_database()
-    if current_db.is_closed():
-        current_db.connect()
-    current_db.create_tables([Todo], safe=True)
+    # Production workers skip the DDL; the schema is created by init_db.py.
+    # The connection goes back to the pool so every worker thread can get one.
+    if CREATE_TABLES_ON_STARTUP:
+        with current_db.connection_context():
+            create_tables()
+    response_cache.clear()
+
+    # Build the OpenAPI schema once so the first /docs or /openapi.json hit
+    # doesn't pay for walking every route
+    app.openapi()
 
     yield
 
     # Shutdown
-    if not current_db.is_closed():
-        current_db.close()
+    current_db.close_idle()
 
 # Create FastAPI app with environment-specific title
 def create_app():
@@ -33,53 +66,92 @@ def create_app():
 
 app = create_app()
 
-# Add CORS middleware with environment-specific origins
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Cache todo reads in-process; added before CORS so it sits inside it and
+# cached bodies never carry another request's CORS headers. Each worker would
+# hold its own copy that other workers' writes can't invalidate, so the cache
+# is only enabled for single-process servers.
+if WORKERS == 1:
+    app.add_middleware(ResponseCacheMiddleware, cache=response_cache, prefix="/api/todos")
+
+# Add CORS middleware with environment-specific origins; with no allowed
+# origins (production until configured) it would only add a Vary header
+if CORS_ORIGINS:
+    app.add_middleware(
+        FastCORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        # Exactly what the frontend's ApiService sends; it doesn't use cookies
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["content-type"],
+    )
+
+# Translate domain exceptions to HTTP errors once, instead of per controller method
+@app.exception_handler(TodoNotFoundException)
+async def todo_not_found_handler(request: Request, exc: TodoNotFoundException):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
 
 # Initialize controller
 todo_controller = TodoController()
 
-# Routes
+# Dependencies: none yet. When adding one, use Depends(some_factory) with a
+# plain function rather than Depends(SomeClass) - a class is a sync callable,
+# so FastAPI would construct it in the threadpool on every request.
+
+# Routes - handlers are async so FastAPI serializes responses on the event loop;
+# only the blocking database work is pushed to the threadpool via run_db
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Todo API", "version": "1.0.0"}
 
 @app.get("/api/todos", response_model=List[TodoResponse])
-def get_all_todos():
+async def get_all_todos():
     """Get all todos"""
-    return todo_controller.get_all_todos()
+    # Serialized in the service; returning a Response skips FastAPI's second
+    # validation and serialization pass (response_model stays for the docs)
+    body = await run_db(todo_controller.get_all_todos_json)
+    return Response(content=body, media_type="application/json")
 
 @app.get("/api/todos/{todo_id}", response_model=TodoResponse)
-def get_todo(todo_id: int):
+async def get_todo(todo_id: int):
     """Get a specific todo by ID"""
-    return todo_controller.get_todo(todo_id)
+    return await run_db(todo_controller.get_todo, todo_id)
 
 @app.post("/api/todos", response_model=TodoResponse)
-def create_todo(todo: TodoCreate):
+async def create_todo(todo: TodoCreate):
     """Create a new todo"""
-    return todo_controller.create_todo(todo)
+    return await run_db(todo_controller.create_todo, todo)
 
 @app.put("/api/todos/{todo_id}", response_model=TodoResponse)
-def update_todo(todo_id: int, update: TodoUpdate):
+async def update_todo(todo_id: int, update: TodoUpdate):
     """Update a todo's details"""
-    return todo_controller.update_todo(todo_id, update)
+    return await run_db(todo_controller.update_todo, todo_id, update)
 
 @app.post("/api/todos/{todo_id}/toggle", response_model=TodoResponse)
-def toggle_todo_completion(todo_id: int):
+async def toggle_todo_completion(todo_id: int):
     """Toggle a todo's completion status"""
-    return todo_controller.toggle_todo_completion(todo_id)
+    return await run_db(todo_controller.toggle_todo_completion, todo_id)
 
 @app.delete("/api/todos/{todo_id}")
-def delete_todo(todo_id: int):
+async def delete_todo(todo_id: int):
     """Delete a todo"""
-    return todo_controller.delete_todo(todo_id)
+    return await run_db(todo_controller.delete_todo, todo_id)
+
+# Only exposed where wiping the table is expected (the test server), so the
+# e2e suite can reset between tests with one request instead of one per todo
+if ENABLE_BULK_DELETE:
+    @app.delete("/api/todos")
+    async def delete_all_todos():
+        """Delete all todos"""
+        return await run_db(todo_controller.delete_all_todos)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT, reload=RELOAD)
+    # Import string form so reload and multiple workers can re-import the app
+    uvicorn.run(
+        "main:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        reload=RELOAD,
+        workers=WORKERS,
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP,
+    )
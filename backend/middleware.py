@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Methods that can change todos; anything else leaves the cache alone
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ResponseCache:
+    """In-process store of serialized GET responses keyed by path, holding at most max_entries"""
+
+    def __init__(self, ttl: float, stale_after: float, max_entries: int):
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: Dict[str, Tuple[float, List[Tuple[bytes, bytes]], bytes]] = {}
+
+    def get(self, key: str) -> Optional[Tuple[List[Tuple[bytes, bytes]], bytes, bool]]:
+        """Return cached (headers, body, is_stale) for a key, or None when missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, headers, body = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl:
+            self._entries.pop(key, None)
+            return None
+        return headers, body, age > self.stale_after
+
+    def set(self, key: str, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        """Store a serialized response, evicting expired and then oldest entries when full"""
+        now = time.monotonic()
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            for stale_key in [k for k, (stored_at, _, _) in self._entries.items() if now - stored_at > self.ttl]:
+                del self._entries[stale_key]
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so the first key is the oldest
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now, headers, body)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every entry and start a new generation"""
+        self.generation += 1
+        self._entries.clear()
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving repeat GETs from memory and dropping entries on writes
+
+    Entries older than the cache's stale_after are still served, and a single
+    background request per key refreshes them (stale-while-revalidate).
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache, prefix: str):
+        self.app = app
+        self.cache = cache
+        self.prefix = prefix
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            # The lifespan call returns once the app has shut down; refreshes
+            # still in flight then would run against a closed database
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                await self._cancel_refreshes()
+            return
+
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method in WRITE_METHODS:
+            # Invalidate before and after the write so no GET that overlapped it
+            # can store a response built from pre-write data
+            self.cache.clear()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.cache.clear()
+            return
+
+        if method != "GET":
+            # HEAD, OPTIONS and the like change nothing and are not cached
+            await self.app(scope, receive, send)
+            return
+
+        # No todo route takes query parameters; caching them would let arbitrary
+        # query strings each pin a copy of the body in memory
+        if scope["query_string"]:
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["path"]
+        cached = self.cache.get(key)
+        if cached is None:
+            await self._fetch(key, scope, receive, send)
+            return
+
+        headers, body, is_stale = cached
+        if is_stale and key not in self._refreshing:
+            self._refreshing.add(key)
+            task = asyncio.create_task(self._refresh(key, dict(scope)))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _fetch(self, key: str, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the request through the app, storing a 200 response if no write overlapped it"""
+        generation = self.cache.generation
+        status = 0
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if (
+                    not message.get("more_body", False)
+                    and status == 200
+                    and generation == self.cache.generation
+                ):
+                    self.cache.set(key, headers, b"".join(chunks))
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+    async def _refresh(self, key: str, scope: Scope) -> None:
+        """Re-run a cached GET in the background with no client attached"""
+        request_sent = False
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if request_sent:
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def discard(message: Message) -> None:
+            pass
+
+        try:
+            await self._fetch(key, scope, receive, discard)
+        except Exception:
+            # Nobody awaits this task, so report the failure here; the stale
+            # entry keeps being served until it expires
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            self._refreshing.discard(key)
+
+    async def _cancel_refreshes(self) -> None:
+        """Cancel background refreshes still running and wait for them to finish"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class FastCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that skips header parsing for requests without an Origin"""
+
+    def __init__(self, app: ASGIApp, **kwargs):
+        super().__init__(app, **kwargs)
+        self.allow_origins = frozenset(self.allow_origins)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or any(name == b"origin" for name, _ in scope["headers"]):
+            await super().__call__(scope, receive, send)
+            return
+
+        # Same-origin and server-to-server traffic: nothing to allow, but the
+        # response still varies by Origin for any shared cache in front of us
+        async def send_with_vary(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"vary", b"Origin")]
+            await send(message)
+
+        await self.app(scope, receive, send_with_vary)
@@ -1,8 +1,21 @@
 from peewee import *
-from config.environment import DATABASE_PATH
+from playhouse.pool import PooledSqliteDatabase
+from config.environment import (
+    DATABASE_PATH, DATABASE_PRAGMAS,
+    DATABASE_MAX_CONNECTIONS, DATABASE_STALE_TIMEOUT, DATABASE_POOL_TIMEOUT,
+)
 
 # Database setup
-db = SqliteDatabase(DATABASE_PATH)
+db = PooledSqliteDatabase(
+    DATABASE_PATH,
+    pragmas=DATABASE_PRAGMAS,
+    max_connections=DATABASE_MAX_CONNECTIONS,
+    stale_timeout=DATABASE_STALE_TIMEOUT,
+    timeout=DATABASE_POOL_TIMEOUT,
+    # The pool hands each connection to one thread at a time, but not always
+    # the thread that opened it
+    check_same_thread=False,
+)
 
 class Todo(Model):
     id = AutoField()
@@ -12,3 +25,8 @@ class Todo(Model):
 
     class Meta:
         database = db
+
+
+def create_tables():
+    """Create all tables if they don't exist yet"""
+    db.create_tables([Todo], safe=True)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List
 from models import Todo
 
 class TodoNotFoundException(Exception):
@@ -9,9 +9,9 @@ class TodoRepository:
     """Repository pattern for todo data access - handles database operations"""
 
     @staticmethod
-    def find_all() -> List[Todo]:
-        """Find all todos from the database"""
-        return list(Todo.select())
+    def find_all() -> List[Dict[str, Any]]:
+        """Find all todos as plain column dicts, without building model instances"""
+        return list(Todo.select().dicts())
 
     @staticmethod
     def find_by_id(todo_id: int) -> Todo:
@@ -27,10 +27,26 @@ class TodoRepository:
         return Todo.create(title=title, description=description)
 
     @staticmethod
-    def save(todo: Todo) -> Todo:
-        """Save a todo to the database"""
-        todo.save()
-        return todo
+    def update_fields(todo_id: int, fields: Dict[str, Any]) -> Todo:
+        """Update the given columns and read the row back in one UPDATE ... RETURNING"""
+        query = (Todo
+                 .update(**fields)
+                 .where(Todo.id == todo_id)
+                 .returning(Todo))
+        for todo in query.execute():
+            return todo
+        raise TodoNotFoundException(f"Todo with id '{todo_id}' not found")
+
+    @staticmethod
+    def toggle_completion(todo_id: int) -> Todo:
+        """Flip a todo's completed flag and read the row back in one UPDATE ... RETURNING"""
+        query = (Todo
+                 .update(completed=~Todo.completed)
+                 .where(Todo.id == todo_id)
+                 .returning(Todo))
+        for todo in query.execute():
+            return todo
+        raise TodoNotFoundException(f"Todo with id '{todo_id}' not found")
 
     @staticmethod
     def delete_by_id(todo_id: int) -> bool:
@@ -38,3 +54,8 @@ class TodoRepository:
         todo = TodoRepository.find_by_id(todo_id)
         todo.delete_instance()
         return True
+
+    @staticmethod
+    def delete_all() -> int:
+        """Delete every todo in a single statement and return how many were removed"""
+        return Todo.delete().execute()
@@ -1,22 +1,42 @@
 from typing import List
+from pydantic import TypeAdapter
 from schemas import TodoResponse, TodoCreate, TodoUpdate
 from repositories import TodoRepository
+from models import Todo
+
+
+# Validators built once at import: a single row, and a whole list of row dicts
+# in one pydantic-core call
+_TODO_ADAPTER = TypeAdapter(TodoResponse)
+_LIST_ADAPTER = TypeAdapter(List[TodoResponse])
+
+
+def _to_response(todo: Todo) -> TodoResponse:
+    """Build a response model from the row's column dict, skipping per-field getattr"""
+    return _TODO_ADAPTER.validate_python(todo.__data__)
+
 
 class TodoService:
     """Service class for todo business logic - uses repository for data access"""
 
+    __slots__ = ("repository",)
+
     def __init__(self):
-        self.repository = TodoRepository()
+        self.repository = TodoRepository
 
     def get_all_todos(self) -> List[TodoResponse]:
         """Get all todos and convert to response models"""
-        todos = self.repository.find_all()
-        return [TodoResponse.model_validate(todo, from_attributes=True) for todo in todos]
+        rows = self.repository.find_all()
+        return _LIST_ADAPTER.validate_python(rows)
+
+    def get_all_todos_json(self) -> bytes:
+        """Get all todos already serialized, for routes that skip response_model handling"""
+        return _LIST_ADAPTER.dump_json(self.get_all_todos())
 
     def get_todo_by_id(self, todo_id: int) -> TodoResponse:
         """Get a specific todo by ID and convert to response model"""
         todo = self.repository.find_by_id(todo_id)
-        return TodoResponse.model_validate(todo, from_attributes=True)
+        return _to_response(todo)
 
     def create_todo(self, todo_data: TodoCreate) -> TodoResponse:
         """Create a new todo from request data"""
@@ -24,31 +44,30 @@ class TodoService:
             title=todo_data.title,
             description=todo_data.description
         )
-        return TodoResponse.model_validate(todo, from_attributes=True)
+        return _to_response(todo)
 
     def update_todo(self, todo_id: int, update_data: TodoUpdate) -> TodoResponse:
         """Update a todo's details with business logic"""
-        todo = self.repository.find_by_id(todo_id)
-        
-        # Business logic: only update provided fields
-        if update_data.title is not None:
-            todo.title = update_data.title
-        if update_data.description is not None:
-            todo.description = update_data.description
-        if update_data.completed is not None:
-            todo.completed = update_data.completed
-        
-        updated_todo = self.repository.save(todo)
-        return TodoResponse.model_validate(updated_todo, from_attributes=True)
+        # Business logic: only update provided fields. Every column is NOT NULL,
+        # so an explicit null is treated the same as an omitted field.
+        fields = update_data.model_dump(exclude_none=True)
+
+        if not fields:
+            return self.get_todo_by_id(todo_id)
+        updated_todo = self.repository.update_fields(todo_id, fields)
+        return _to_response(updated_todo)
 
     def toggle_todo_completion(self, todo_id: int) -> TodoResponse:
         """Toggle a todo's completion status (business logic)"""
-        todo = self.repository.find_by_id(todo_id)
-        todo.completed = not todo.completed
-        updated_todo = self.repository.save(todo)
-        return TodoResponse.model_validate(updated_todo, from_attributes=True)
+        updated_todo = self.repository.toggle_completion(todo_id)
+        return _to_response(updated_todo)
 
     def delete_todo(self, todo_id: int) -> dict:
         """Delete a todo and return success message"""
         self.repository.delete_by_id(todo_id)
         return {"message": f"Todo with id '{todo_id}' deleted"}
+
+    def delete_all_todos(self) -> dict:
+        """Delete all todos and return how many were removed"""
+        deleted = self.repository.delete_all()
+        return {"message": f"Deleted {deleted} todos"}
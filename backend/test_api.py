@@ -1,45 +1,70 @@
+import logging
+import os
+import time
+
+# Always run against the disposable test database, even if APP_ENV is exported
+os.environ["APP_ENV"] = "test"
+
 import pytest
 from fastapi.testclient import TestClient
-from peewee import SqliteDatabase
-from main import app
+from main import app, response_cache
 from models import Todo
+from controllers import TodoController
+from repositories import TodoNotFoundException
+from schemas import TodoCreate, TodoUpdate
 
 
-@pytest.fixture(scope="function", autouse=True)
-def test_db():
-    """Reset database before each test"""
+@pytest.fixture(scope="session")
+def schema():
+    """Create the tables once for the whole test session"""
+    from config.environment import APP_ENV
     from models import Todo, db
-    
-    # Ensure we're connected
-    if db.is_closed():
-        db.connect()
-    
-    # Drop and recreate tables to start fresh
+
+    if APP_ENV != "test":
+        pytest.exit(f"refusing to drop tables with APP_ENV={APP_ENV!r}", returncode=1)
+
+    db.connect(reuse_if_open=True)
     db.drop_tables([Todo], safe=True)
     db.create_tables([Todo])
-    
+
     yield db
-    
-    # Clean up after test
+
     db.drop_tables([Todo], safe=True)
 
 
-@pytest.fixture
-def client(test_db):
-    """Create a test client using the main app"""
+@pytest.fixture(scope="function", autouse=True)
+def test_db(schema):
+    """Reset database before each test"""
+    # A single DELETE instead of dropping and recreating the schema. API calls
+    # run on other pooled connections, so a per-test transaction can't be used.
+    Todo.delete().execute()
+    response_cache.clear()
+
+    yield schema
+
+
+@pytest.fixture(scope="session")
+def client(schema):
+    """Create one test client (and run the app lifespan once) for the session"""
     with TestClient(app) as test_client:
         yield test_client
 
 
+@pytest.fixture(scope="session")
+def controller():
+    """Controller for tests that check business logic without the HTTP stack"""
+    return TodoController()
+
+
 @pytest.fixture
 def setup_todos():
-    """Setup initial test todos using Peewee directly"""
-    Todo.create(title="Buy groceries", description="Milk, bread, eggs", completed=False)
-    Todo.create(title="Write tests", description="Unit tests for todo API", completed=True)
-    return [
+    """Setup initial test todos using Peewee directly, in one multi-row INSERT"""
+    todos = [
         {"title": "Buy groceries", "description": "Milk, bread, eggs", "completed": False},
         {"title": "Write tests", "description": "Unit tests for todo API", "completed": True}
     ]
+    Todo.insert_many(todos).execute()
+    return todos
 
 
 def test_read_root(client):
@@ -49,6 +74,27 @@ def test_read_root(client):
     assert response.json() == {"message": "Todo API", "version": "1.0.0"}
 
 
+def test_cors_headers(client):
+    """Test CORS headers for allowed origins and origin-less requests"""
+    from config.environment import CORS_ORIGINS
+    origin = CORS_ORIGINS[0]
+
+    response = client.get("/api/todos", headers={"Origin": origin})
+    assert response.headers["access-control-allow-origin"] == origin
+
+    response = client.get("/api/todos")
+    assert "access-control-allow-origin" not in response.headers
+    assert response.headers["vary"] == "Origin"
+
+    response = client.options("/api/todos", headers={
+        "Origin": origin,
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type",
+    })
+    assert response.status_code == 200
+    assert "access-control-allow-credentials" not in response.headers
+
+
 def test_get_all_todos_empty(client):
     """Test getting all todos when none exist"""
     response = client.get("/api/todos")
@@ -128,6 +174,21 @@ def test_partial_update_todo(client):
     assert data["completed"] == True  # Should be updated
 
 
+def test_update_todo_ignores_null_fields(client):
+    """Test that explicit nulls leave fields unchanged"""
+    todo = Todo.create(title="Original title", description="Original desc", completed=False)
+
+    response = client.put(
+        f"/api/todos/{todo.id}",
+        json={"title": None, "description": None, "completed": True}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["title"] == "Original title"
+    assert data["description"] == "Original desc"
+    assert data["completed"] == True
+
+
 def test_toggle_todo_completion(client):
     """Test toggling a todo's completion status"""
     # Create a todo first
@@ -146,6 +207,89 @@ def test_toggle_todo_completion(client):
     assert data["completed"] == False
 
 
+def test_get_all_todos_cached_until_write(client):
+    """Test that list reads are cached and invalidated by API writes"""
+    response = client.get("/api/todos")
+    assert response.json() == []
+
+    # Rows written behind the API's back are not visible while cached
+    Todo.create(title="Direct insert", description="", completed=False)
+    response = client.get("/api/todos")
+    assert response.json() == []
+
+    # Any write through the API drops the cached list
+    response = client.post("/api/todos", json={"title": "Via API"})
+    assert response.status_code == 200
+
+    response = client.get("/api/todos")
+    todo_titles = [t["title"] for t in response.json()]
+    assert todo_titles == ["Direct insert", "Via API"]
+
+
+def test_head_request_keeps_cached_entry(client):
+    """Test that HEAD and OPTIONS requests are not treated as writes"""
+    client.get("/api/todos")
+    generation = response_cache.generation
+    client.head("/api/todos")
+    client.options("/api/todos")
+    assert len(response_cache) == 1
+    assert response_cache.generation == generation
+
+
+def test_response_cache_stays_bounded(client, setup_todos, monkeypatch):
+    """Test that query strings bypass the cache and entries are capped"""
+    for i in range(50):
+        response = client.get(f"/api/todos?junk={i}")
+        assert len(response.json()) == 2
+    assert len(response_cache) == 0
+
+    monkeypatch.setattr(response_cache, "max_entries", 2)
+    todo_ids = [todo.id for todo in Todo.select()]
+    for todo_id in todo_ids * 3:
+        client.get(f"/api/todos/{todo_id}")
+    client.get("/api/todos")
+    client.get("/api/todos/999")  # 404s are never stored
+    assert len(response_cache) == 2
+
+
+def test_stale_todo_list_refreshed_in_background(client, monkeypatch):
+    """Test that stale cached lists are served and then revalidated"""
+    monkeypatch.setattr(response_cache, "stale_after", 0)
+    response = client.get("/api/todos")
+    assert response.json() == []
+
+    Todo.create(title="Direct insert", description="", completed=False)
+
+    # The stale copy is served immediately while a refresh runs behind it
+    response = client.get("/api/todos")
+    assert response.json() == []
+
+    for _ in range(50):
+        response = client.get("/api/todos")
+        if response.json():
+            break
+        time.sleep(0.01)
+    assert [t["title"] for t in response.json()] == ["Direct insert"]
+
+
+def test_failed_background_refresh_is_logged(client, monkeypatch, caplog):
+    """Test that a failing stale-while-revalidate refresh is logged and the stale copy kept"""
+    monkeypatch.setattr(response_cache, "stale_after", 0)
+    assert client.get("/api/todos").json() == []
+
+    def broken_list(self):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(TodoController, "get_all_todos_json", broken_list)
+    with caplog.at_level(logging.ERROR, logger="middleware"):
+        assert client.get("/api/todos").json() == []
+        for _ in range(50):
+            if caplog.records:
+                break
+            time.sleep(0.01)
+    assert "Background refresh of /api/todos failed" in caplog.text
+
+
 def test_delete_todo(client, setup_todos):
     """Test deleting a todo"""
     # Create a todo to delete
@@ -160,6 +304,17 @@ def test_delete_todo(client, setup_todos):
     assert response.status_code == 404
 
 
+def test_delete_all_todos(client, setup_todos):
+    """Test the test-only bulk delete endpoint"""
+    assert len(client.get("/api/todos").json()) == 2
+
+    response = client.delete("/api/todos")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Deleted 2 todos"
+
+    assert client.get("/api/todos").json() == []
+
+
 def test_todo_not_found(client):
     """Test operations on non-existent todo"""
     response = client.get("/api/todos/999")
@@ -188,39 +343,30 @@ def test_create_todo_minimal(client):
     assert data["completed"] == False  # Should default to False
 
 
-def test_complex_workflow(client):
-    """Test a complex workflow with multiple operations"""
+def test_complex_workflow(controller):
+    """Test a complex workflow with multiple operations (business logic, no HTTP)"""
     # Create todo
-    response = client.post(
-        "/api/todos",
-        json={"title": "Workflow todo", "description": "Testing workflow"}
-    )
-    assert response.status_code == 200
-    todo_id = response.json()["id"]
+    todo = controller.create_todo(TodoCreate(title="Workflow todo", description="Testing workflow"))
+    todo_id = todo.id
 
     # Update description
-    response = client.put(
-        f"/api/todos/{todo_id}",
-        json={"description": "Updated description"}
-    )
-    assert response.json()["description"] == "Updated description"
-    assert response.json()["title"] == "Workflow todo"  # Should remain unchanged
+    todo = controller.update_todo(todo_id, TodoUpdate(description="Updated description"))
+    assert todo.description == "Updated description"
+    assert todo.title == "Workflow todo"  # Should remain unchanged
 
     # Toggle completion
-    response = client.post(f"/api/todos/{todo_id}/toggle")
-    assert response.json()["completed"] == True
+    todo = controller.toggle_todo_completion(todo_id)
+    assert todo.completed == True
 
     # Update title while keeping completion status
-    response = client.put(
-        f"/api/todos/{todo_id}",
-        json={"title": "Final title"}
-    )
-    assert response.json()["title"] == "Final title"
-    assert response.json()["completed"] == True  # Should remain True
+    todo = controller.update_todo(todo_id, TodoUpdate(title="Final title"))
+    assert todo.title == "Final title"
+    assert todo.completed == True  # Should remain True
 
     # Delete
-    response = client.delete(f"/api/todos/{todo_id}")
-    assert response.status_code == 200
+    assert "deleted" in controller.delete_todo(todo_id)["message"]
+    with pytest.raises(TodoNotFoundException):
+        controller.get_todo(todo_id)
 
 
 if __name__ == "__main__":
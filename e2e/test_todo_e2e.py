@@ -3,13 +3,86 @@ import requests
 import subprocess
 import time
 import os
+import shutil
 import signal
+import socket
 import tempfile
+from requests.adapters import HTTPAdapter
 from playwright.sync_api import Page, expect, Browser, BrowserContext, Playwright, sync_playwright
 
-# Test environment uses different ports
-API_URL = "http://localhost:8001"
-APP_URL = "http://localhost:5175"
+# Resolved from this file so the suite also runs from the repository root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(PROJECT_ROOT, "backend")
+FRONTEND_DIR = os.path.join(PROJECT_ROOT, "frontend")
+
+# Test environment uses different ports.
+# Under pytest-xdist each worker (gw0, gw1, ...) runs its own backend, frontend
+# and database, offset from the base ports by its index
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+WORKER_INDEX = int(WORKER_ID.lstrip("gw") or 0)
+BACKEND_PORT = 8001 + WORKER_INDEX
+FRONTEND_PORT = 5175 + WORKER_INDEX
+API_URL = f"http://localhost:{BACKEND_PORT}"
+APP_URL = f"http://localhost:{FRONTEND_PORT}"
+TEST_DB_PATH = os.path.join(tempfile.gettempdir(), f"todos_e2e_{WORKER_ID}.sqlite")
+# VITE_API_URL is baked in at build time, so each worker builds its own bundle
+FRONTEND_DIST = os.path.join(tempfile.gettempdir(), f"todos_e2e_dist_{WORKER_ID}")
+STARTUP_TIMEOUT = 30  # seconds each service gets to come up
+API_POOL_SIZE = 4  # keep-alive sockets api_session holds open to the backend
+
+def wait_for_service(url, port, timeout=STARTUP_TIMEOUT):
+    """Wait until something listens on localhost:port, then confirm url answers 200"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            # create_connection tries every address localhost resolves to,
+            # so both IPv4 and IPv6-only listeners are found
+            socket.create_connection(("localhost", port), timeout=0.05).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    else:
+        return False
+
+    # Listening isn't the same as serving; one HTTP request confirms it
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.05)
+    return False
+
+def stop_process(process):
+    """Stop a service and everything it spawned; npm runs vite as a child process"""
+    # Each service leads its own process group (start_new_session), so one
+    # signal reaches the whole tree. Give it a moment to exit cleanly, then kill.
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=0.5)
+    except ProcessLookupError:
+        pass
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.wait()
+
+def submit_todo_form(page, title, description=None):
+    """Fill the create form and submit it; description is left blank when None"""
+    page.get_by_test_id("todo-title-input").fill(title)
+    if description is not None:
+        page.get_by_test_id("todo-description-input").fill(description)
+    page.get_by_test_id("create-todo-btn").click()
+
+def clear_todos(session):
+    """Delete every todo through the test backend's bulk endpoint"""
+    response = session.delete(f"{API_URL}/api/todos", timeout=2)
+    # Leftover rows would surface later as misleading assertion failures
+    response.raise_for_status()
 
 class TestTodoAppE2E:
     """End-to-end tests for Todo App"""
@@ -21,51 +94,57 @@ class TestTodoAppE2E:
         frontend_process = None
         
         try:
-            # Start test backend on port 8001 using main.py with APP_ENV=test
-            env = os.environ.copy()
-            env["APP_ENV"] = "test"
+            # One snapshot of the environment, extended for each service
+            base_env = dict(os.environ)
             
+            # Start this worker's test backend using main.py with APP_ENV=test
+            env = {
+                **base_env,
+                "APP_ENV": "test",
+                "DATABASE_PATH": TEST_DB_PATH,
+                "SERVER_PORT": str(BACKEND_PORT),
+                "CORS_ORIGINS": APP_URL,
+            }
+            
+            # Server output is never read; left on an undrained PIPE it would
+            # eventually fill the buffer and block the server mid-test
             backend_process = subprocess.Popen(
-                ["../backend/.venv/bin/python", "main.py"],
-                cwd="../backend",
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=env
+                [os.path.join(BACKEND_DIR, ".venv", "bin", "python"), "main.py"],
+                cwd=BACKEND_DIR,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=env,
+                start_new_session=True
             )
             
-            # Wait for backend to start
-            for _ in range(30):  # Wait up to 30 seconds
-                try:
-                    response = requests.get(f"{API_URL}/", timeout=1)
-                    if response.status_code == 200:
-                        break
-                except:
-                    time.sleep(1)
-            else:
-                raise Exception("Backend failed to start")
-            
-            # Start test frontend on port 5174
-            frontend_env = os.environ.copy()
-            frontend_env["VITE_API_URL"] = API_URL
-            frontend_env["PORT"] = "5175"
+            # Build the frontend once and serve the static bundle, so page loads
+            # skip the dev server's on-demand transforms. The backend needs
+            # nothing from the frontend, so it boots while the bundle builds.
+            frontend_env = {**base_env, "VITE_API_URL": API_URL}
+            subprocess.run(
+                ["npm", "run", "build", "--", "--outDir", FRONTEND_DIST, "--emptyOutDir"],
+                cwd=FRONTEND_DIR,
+                stdout=subprocess.DEVNULL,
+                env=frontend_env,
+                check=True
+            )
             
+            # strictPort fails fast instead of silently moving to a port
+            # another worker owns
             frontend_process = subprocess.Popen(
-                ["npm", "run", "dev", "--", "--port", "5175"],
-                cwd="../frontend",
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=frontend_env
+                ["npm", "run", "preview", "--", "--outDir", FRONTEND_DIST,
+                 "--port", str(FRONTEND_PORT), "--strictPort"],
+                cwd=FRONTEND_DIR,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=frontend_env,
+                start_new_session=True
             )
             
-            # Wait for frontend to start
-            for _ in range(30):  # Wait up to 30 seconds
-                try:
-                    response = requests.get(APP_URL, timeout=1)
-                    if response.status_code == 200:
-                        break
-                except:
-                    time.sleep(1)
-            else:
+            # Wait for both services; the backend has usually been up for a while
+            if not wait_for_service(f"{API_URL}/", BACKEND_PORT):
+                raise Exception("Backend failed to start")
+            if not wait_for_service(APP_URL, FRONTEND_PORT):
                 raise Exception("Frontend failed to start")
             
             print(f"Test services started: Backend={API_URL}, Frontend={APP_URL}")
@@ -74,29 +153,31 @@ class TestTodoAppE2E:
         finally:
             # Cleanup processes
             if backend_process:
-                backend_process.terminate()
-                try:
-                    backend_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    backend_process.kill()
+                stop_process(backend_process)
             
             if frontend_process:
-                frontend_process.terminate()
-                try:
-                    frontend_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    frontend_process.kill()
+                stop_process(frontend_process)
             
-            # Clean up test database
-            test_db_file = os.path.join(tempfile.gettempdir(), "test_todo.db")
-            if os.path.exists(test_db_file):
-                os.remove(test_db_file)
+            # Clean up test database, including its WAL side files
+            for path in (TEST_DB_PATH, f"{TEST_DB_PATH}-wal", f"{TEST_DB_PATH}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            shutil.rmtree(FRONTEND_DIST, ignore_errors=True)
 
     @pytest.fixture(scope="session")
     def browser(self):
         """Session-scoped browser instance for speed"""
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
+            # Playwright already disables extensions, sync, background networking,
+            # timer throttling, translate, the back/forward cache and /dev/shm
+            # use; the GPU stack is the remaining unused piece. pytest handles
+            # Ctrl+C, so the browser doesn't need its own SIGINT handling.
+            browser = p.chromium.launch(
+                headless=True,
+                args=["--disable-gpu"],
+                chromium_sandbox=False,
+                handle_sigint=False
+            )
             yield browser
             browser.close()
 
@@ -107,12 +188,22 @@ class TestTodoAppE2E:
             viewport={"width": 1280, "height": 720},
             ignore_https_errors=True
         )
+        # Web fonts and the favicon don't affect any assertion, so answer them
+        # locally instead of going out to the network. They are fulfilled
+        # rather than aborted: a failed load would log the console errors
+        # that the console tests look for.
+        context.route(
+            "https://fonts.googleapis.com/**",
+            lambda route: route.fulfill(status=200, content_type="text/css", body="")
+        )
+        context.route("https://fonts.gstatic.com/**", lambda route: route.fulfill(status=200, body=""))
+        context.route("**/vite.svg", lambda route: route.fulfill(status=204))
         yield context
         context.close()
 
-    @pytest.fixture(scope="function")  
+    @pytest.fixture(scope="session")
     def page(self, browser_context):
-        """Function-scoped page that reuses the browser context"""
+        """Session-scoped page; _reset_page navigates it fresh before every test"""
         page = browser_context.new_page()
         # Set shorter default timeouts for speed
         page.set_default_timeout(10000)  # 10s instead of default 30s
@@ -120,259 +211,273 @@ class TestTodoAppE2E:
         yield page
         page.close()
 
-    @pytest.fixture(autouse=True)
-    def cleanup_todos(self):
-        """Clean up todos before each test - optimized for speed"""
+    @pytest.fixture(scope="session")
+    def api_session(self):
+        """Session-scoped HTTP client so API calls reuse one keep-alive connection"""
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        # A single host, so one pool; sockets stay open across tests
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=API_POOL_SIZE))
+        yield session
+        session.close()
+
+    @pytest.fixture(scope="session", autouse=True)
+    def _clean_db_once(self, test_services, api_session):
+        """Start the session from an empty database, whatever an earlier run left behind"""
+        # The bulk DELETE already exercises the write path; one list read
+        # warms the read path too, so the first test doesn't pay for it
+        clear_todos(api_session)
         try:
-            # Get all todos
-            response = requests.get(f"{API_URL}/api/todos", timeout=2)
-            if response.ok:
-                todos = response.json()
-                # Delete each todo with shorter timeout
-                for todo in todos:
-                    requests.delete(f"{API_URL}/api/todos/{todo['id']}", timeout=1)
+            api_session.get(f"{API_URL}/api/todos", timeout=2)
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
-            # Backend might not be running or slow
             pass
+
+    @pytest.fixture(autouse=True)
+    def cleanup_todos(self, request, api_session):
+        """Clean up todos after each test, so the next one starts from an empty list"""
         yield
+        # Tests that never create or change todos leave nothing to reset
+        if not request.node.get_closest_marker("no_cleanup"):
+            try:
+                clear_todos(api_session)
+            except requests.exceptions.ConnectionError:
+                # The backend went away during the test, which has already
+                # reported that failure; the next startup clears the table
+                pass
+
+    @pytest.fixture
+    def seed_todos(self, api_session, page):
+        """Create todos through the API and re-render once, for tests where creation isn't under test"""
+        def seed(*todos):
+            created = []
+            # One at a time so ids follow argument order (todo-1, todo-2, ...)
+            for title, description in todos:
+                response = api_session.post(
+                    f"{API_URL}/api/todos",
+                    json={"title": title, "description": description},
+                    timeout=2
+                )
+                response.raise_for_status()
+                created.append(response.json())
+            page.reload()
+            return created
+        return seed
 
+    @pytest.fixture
+    def seed_todo(self, seed_todos):
+        """Create a single todo through the API and re-render"""
+        def seed(title, description=""):
+            return seed_todos((title, description))[0]
+        return seed
+
+    @pytest.fixture(autouse=True)
+    def _reset_page(self, page):
+        """Load the app before each test so it starts from a fresh render"""
+        page.goto(APP_URL)
+        yield
+
+    @pytest.mark.no_cleanup
     def test_app_title(self, page: Page):
         """Test that the app displays the correct title"""
-        page.goto(APP_URL)
         expect(page.locator("h1")).to_contain_text("Todo List App")
 
+    @pytest.mark.no_cleanup
     def test_console_errors_on_render(self, page: Page):
         """Test that there are no console errors when rendering the main SPA screen"""
         console_errors = []
-        console_warnings = []
         
-        # Listen for console messages
+        # Only errors fail the test, so only errors are kept
         def handle_console_msg(msg):
             if msg.type == 'error':
-                console_errors.append(f"Console Error: {msg.text}")
-            elif msg.type == 'warning':
-                console_warnings.append(f"Console Warning: {msg.text}")
+                console_errors.append(msg.text)
         
+        # The page is shared across tests, so the listener is always removed
         page.on("console", handle_console_msg)
-        
-        # Navigate to the app
-        page.goto(APP_URL)
-        
-        # Wait for the app to fully load
-        expect(page.locator("h1")).to_contain_text("Todo List App")
-        
-        # Wait briefly for any async errors
-        page.wait_for_timeout(500)
+        try:
+            # Reload so the listener sees the whole render, and wait for the
+            # todo list request the app makes on mount
+            with page.expect_response(lambda response: "/api/todos" in response.url):
+                page.reload()
+            
+            # Wait for the app to fully load
+            expect(page.locator("h1")).to_contain_text("Todo List App")
+            
+            # Let the app handle the response before checking for errors
+            page.evaluate("() => new Promise(resolve => setTimeout(resolve, 0))")
+        finally:
+            page.remove_listener("console", handle_console_msg)
         
         # Assert no console errors occurred
-        if console_errors:
-            error_messages = "\n".join(console_errors)
-            raise AssertionError(f"Console errors detected:\n{error_messages}")
-        
-        # Log warnings for informational purposes (don't fail the test)
-        if console_warnings:
-            print(f"\nConsole warnings detected (non-fatal):\n" + "\n".join(console_warnings))
+        assert not console_errors, "Console errors detected:\n" + "\n".join(console_errors)
 
     def test_console_errors_during_interactions(self, page: Page):
         """Test that there are no console errors during typical user interactions"""
         console_errors = []
-        console_warnings = []
         
-        # Listen for console messages
+        # Only errors fail the test, so only errors are kept
         def handle_console_msg(msg):
             if msg.type == 'error':
-                console_errors.append(f"Console Error: {msg.text}")
-            elif msg.type == 'warning':
-                console_warnings.append(f"Console Warning: {msg.text}")
+                console_errors.append(msg.text)
         
+        # The page is shared across tests, so the listener is always removed
         page.on("console", handle_console_msg)
-        
-        # Navigate to the app
-        page.goto(APP_URL)
-        
-        # Wait for the app to fully load
-        expect(page.locator("h1")).to_contain_text("Todo List App")
-        
-        # Create a todo
-        page.fill('[data-testid="todo-title-input"]', "Test Todo")
-        page.fill('[data-testid="todo-description-input"]', "Test description")
-        page.click('[data-testid="create-todo-btn"]')
-        
-        # Wait for todo to appear
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
-        
-        # Perform various todo operations
-        page.click('[data-testid="toggle-1"]')  # Toggle completion
-        page.click('[data-testid="edit-1"]')    # Start edit
-        page.click('[data-testid="cancel-edit-1"]')  # Cancel edit
-        page.click('[data-testid="toggle-1"]')  # Toggle back
-        
-        # Wait for all operations to complete
-        page.wait_for_timeout(300)
-        
-        # Delete the todo
-        page.click('[data-testid="delete-1"]')
-        
-        # Wait briefly for any async errors
-        page.wait_for_timeout(300)
+        try:
+            # Wait for the app to fully load
+            expect(page.locator("h1")).to_contain_text("Todo List App")
+            
+            # Create a todo
+            submit_todo_form(page, "Test Todo", "Test description")
+            
+            # Wait for todo to appear
+            expect(page.get_by_test_id("todo-1")).to_be_visible()
+            
+            # Perform various todo operations
+            checkbox = page.get_by_test_id("toggle-1")
+            checkbox.click()  # Toggle completion
+            expect(checkbox).to_be_checked()
+            page.get_by_test_id("edit-1").click()    # Start edit
+            page.get_by_test_id("cancel-edit-1").click()  # Cancel edit
+            checkbox.click()  # Toggle back
+            
+            # Wait for all operations to complete
+            expect(checkbox).not_to_be_checked()
+            
+            # Delete the todo
+            page.get_by_test_id("delete-1").click()
+            
+            # Wait for the refetched, now empty list
+            expect(page.get_by_test_id("todo-1")).not_to_be_visible()
+            expect(page.locator("text=No todos yet")).to_be_visible()
+        finally:
+            page.remove_listener("console", handle_console_msg)
         
         # Assert no console errors occurred during interactions
-        if console_errors:
-            error_messages = "\n".join(console_errors)
-            raise AssertionError(f"Console errors detected during interactions:\n{error_messages}")
-        
-        # Log warnings for informational purposes
-        if console_warnings:
-            print(f"\nConsole warnings detected during interactions (non-fatal):\n" + "\n".join(console_warnings))
+        assert not console_errors, "Console errors detected during interactions:\n" + "\n".join(console_errors)
 
+    @pytest.mark.no_cleanup
     def test_empty_state(self, page: Page):
         """Test empty state when no todos exist"""
-        page.goto(APP_URL)
         expect(page.locator("text=No todos yet")).to_be_visible()
 
     def test_create_todo(self, page: Page):
         """Test creating a new todo"""
-        page.goto(APP_URL)
-        
         # Fill in the form
-        page.fill('[data-testid="todo-title-input"]', "Buy groceries")
-        page.fill('[data-testid="todo-description-input"]', "Milk, bread, eggs")
+        page.get_by_test_id("todo-title-input").fill("Buy groceries")
+        page.get_by_test_id("todo-description-input").fill("Milk, bread, eggs")
         
         # Submit the form
-        page.click('[data-testid="create-todo-btn"]')
+        page.get_by_test_id("create-todo-btn").click()
         
         # Wait for the todo to appear
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
+        expect(page.get_by_test_id("todo-1")).to_be_visible()
         
         # Check the todo content
-        expect(page.locator('[data-testid="title-1"]')).to_contain_text("Buy groceries")
-        expect(page.locator('[data-testid="description-1"]')).to_contain_text("Milk, bread, eggs")
+        expect(page.get_by_test_id("title-1")).to_contain_text("Buy groceries")
+        expect(page.get_by_test_id("description-1")).to_contain_text("Milk, bread, eggs")
 
     def test_create_todo_minimal(self, page: Page):
         """Test creating a todo with only title"""
-        page.goto(APP_URL)
-        
         # Fill only title
-        page.fill('[data-testid="todo-title-input"]', "Simple task")
+        page.get_by_test_id("todo-title-input").fill("Simple task")
         
         # Submit the form
-        page.click('[data-testid="create-todo-btn"]')
+        page.get_by_test_id("create-todo-btn").click()
         
         # Wait for the todo to appear
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
-        expect(page.locator('[data-testid="title-1"]')).to_contain_text("Simple task")
+        expect(page.get_by_test_id("todo-1")).to_be_visible()
+        expect(page.get_by_test_id("title-1")).to_contain_text("Simple task")
 
-    def test_toggle_todo_completion(self, page: Page):
+    def test_toggle_todo_completion(self, page: Page, seed_todo):
         """Test toggling todo completion status"""
-        page.goto(APP_URL)
-        
         # Create a todo first
-        page.fill('[data-testid="todo-title-input"]', "Complete me")
-        page.click('[data-testid="create-todo-btn"]')
+        seed_todo("Complete me")
         
         # Wait for todo to appear
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
+        expect(page.get_by_test_id("todo-1")).to_be_visible()
         
         # Check initial state (not completed)
-        checkbox = page.locator('[data-testid="toggle-1"]')
+        checkbox = page.get_by_test_id("toggle-1")
         expect(checkbox).not_to_be_checked()
         
         # Toggle to completed
-        page.click('[data-testid="toggle-1"]')
+        checkbox.click()
         expect(checkbox).to_be_checked()
         
         # Toggle back to incomplete
-        page.click('[data-testid="toggle-1"]')
+        checkbox.click()
         expect(checkbox).not_to_be_checked()
 
-    def test_edit_todo(self, page: Page):
+    def test_edit_todo(self, page: Page, seed_todo):
         """Test editing a todo"""
-        page.goto(APP_URL)
-        
         # Create a todo
-        page.fill('[data-testid="todo-title-input"]', "Original Title")
-        page.fill('[data-testid="todo-description-input"]', "Original Description")
-        page.click('[data-testid="create-todo-btn"]')
+        seed_todo("Original Title", "Original Description")
         
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
+        expect(page.get_by_test_id("todo-1")).to_be_visible()
         
         # Start editing
-        page.click('[data-testid="edit-1"]')
+        page.get_by_test_id("edit-1").click()
         
         # Edit fields should be visible
-        expect(page.locator('[data-testid="edit-title-1"]')).to_be_visible()
-        expect(page.locator('[data-testid="edit-description-1"]')).to_be_visible()
+        expect(page.get_by_test_id("edit-title-1")).to_be_visible()
+        expect(page.get_by_test_id("edit-description-1")).to_be_visible()
         
         # Update values
-        page.fill('[data-testid="edit-title-1"]', "Updated Title")
-        page.fill('[data-testid="edit-description-1"]', "Updated Description")
+        page.get_by_test_id("edit-title-1").fill("Updated Title")
+        page.get_by_test_id("edit-description-1").fill("Updated Description")
         
         # Save changes
-        page.click('[data-testid="save-edit-1"]')
+        page.get_by_test_id("save-edit-1").click()
         
         # Check updated content
-        expect(page.locator('[data-testid="title-1"]')).to_contain_text("Updated Title")
-        expect(page.locator('[data-testid="description-1"]')).to_contain_text("Updated Description")
+        expect(page.get_by_test_id("title-1")).to_contain_text("Updated Title")
+        expect(page.get_by_test_id("description-1")).to_contain_text("Updated Description")
 
-    def test_cancel_edit_todo(self, page: Page):
+    def test_cancel_edit_todo(self, page: Page, seed_todo):
         """Test canceling todo edit"""
-        page.goto(APP_URL)
-        
         # Create a todo
-        page.fill('[data-testid="todo-title-input"]', "Original Title")
-        page.click('[data-testid="create-todo-btn"]')
+        seed_todo("Original Title")
         
         # Start editing
-        page.click('[data-testid="edit-1"]')
+        page.get_by_test_id("edit-1").click()
         
         # Make changes
-        page.fill('[data-testid="edit-title-1"]', "Changed Title")
+        page.get_by_test_id("edit-title-1").fill("Changed Title")
         
         # Cancel edit
-        page.click('[data-testid="cancel-edit-1"]')
+        page.get_by_test_id("cancel-edit-1").click()
         
         # Original content should remain
-        expect(page.locator('[data-testid="title-1"]')).to_contain_text("Original Title")
+        expect(page.get_by_test_id("title-1")).to_contain_text("Original Title")
 
-    def test_delete_todo(self, page: Page):
+    def test_delete_todo(self, page: Page, seed_todo):
         """Test deleting a todo"""
-        page.goto(APP_URL)
-        
         # Create a todo
-        page.fill('[data-testid="todo-title-input"]', "Delete me")
-        page.click('[data-testid="create-todo-btn"]')
+        seed_todo("Delete me")
         
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
+        expect(page.get_by_test_id("todo-1")).to_be_visible()
         
         # Delete the todo
-        page.click('[data-testid="delete-1"]')
+        page.get_by_test_id("delete-1").click()
         
         # Check the todo is gone
-        expect(page.locator('[data-testid="todo-1"]')).not_to_be_visible()
+        expect(page.get_by_test_id("todo-1")).not_to_be_visible()
         expect(page.locator("text=No todos yet")).to_be_visible()
 
-    def test_multiple_todos(self, page: Page):
+    def test_multiple_todos(self, page: Page, seed_todos):
         """Test handling multiple todos"""
-        page.goto(APP_URL)
-        
-        # Create first todo
-        page.fill('[data-testid="todo-title-input"]', "First Todo")
-        page.click('[data-testid="create-todo-btn"]')
-        
-        # Create second todo
-        page.fill('[data-testid="todo-title-input"]', "Second Todo")
-        page.click('[data-testid="create-todo-btn"]')
+        # Create two todos
+        seed_todos(("First Todo", ""), ("Second Todo", ""))
         
         # Check both todos are visible
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
-        expect(page.locator('[data-testid="todo-2"]')).to_be_visible()
+        expect(page.get_by_test_id("todo-1")).to_be_visible()
+        expect(page.get_by_test_id("todo-2")).to_be_visible()
         
         # Check titles
-        expect(page.locator('[data-testid="title-1"]')).to_contain_text("First Todo")
-        expect(page.locator('[data-testid="title-2"]')).to_contain_text("Second Todo")
+        expect(page.get_by_test_id("title-1")).to_contain_text("First Todo")
+        expect(page.get_by_test_id("title-2")).to_contain_text("Second Todo")
         
         # Toggle completion for first todo
-        page.click('[data-testid="toggle-1"]')
+        page.get_by_test_id("toggle-1").click()
         
         # Check badge counts
         expect(page.locator("text=1 Pending")).to_be_visible()
@@ -380,60 +485,50 @@ class TestTodoAppE2E:
 
     def test_todo_persistence_after_refresh(self, page: Page):
         """Test that todos persist after page refresh"""
-        page.goto(APP_URL)
-        
         # Create todo
-        page.fill('[data-testid="todo-title-input"]', "Persistent Todo")
-        page.fill('[data-testid="todo-description-input"]', "Should survive refresh")
-        page.click('[data-testid="create-todo-btn"]')
+        submit_todo_form(page, "Persistent Todo", "Should survive refresh")
         
-        # Toggle completion
-        page.click('[data-testid="toggle-1"]')
+        # Toggle completion, and wait for the refetched list to show it so the
+        # reload can't cancel the request
+        page.get_by_test_id("toggle-1").click()
+        expect(page.get_by_test_id("toggle-1")).to_be_checked()
         
-        # Refresh the page
+        # Refresh the page - this test is about the SPA rehydrating from the API
         page.reload()
         
         # Check todo is still there with correct state
-        expect(page.locator('[data-testid="todo-1"]')).to_be_visible()
-        expect(page.locator('[data-testid="title-1"]')).to_contain_text("Persistent Todo")
-        expect(page.locator('[data-testid="description-1"]')).to_contain_text("Should survive refresh")
-        expect(page.locator('[data-testid="toggle-1"]')).to_be_checked()
+        expect(page.get_by_test_id("todo-1")).to_be_visible()
+        expect(page.get_by_test_id("title-1")).to_contain_text("Persistent Todo")
+        expect(page.get_by_test_id("description-1")).to_contain_text("Should survive refresh")
+        expect(page.get_by_test_id("toggle-1")).to_be_checked()
 
-    def test_complex_workflow(self, page: Page):
+    def test_complex_workflow(self, page: Page, seed_todos):
         """Test a complex workflow with multiple operations"""
-        page.goto(APP_URL)
-        
         # Create multiple todos
-        page.fill('[data-testid="todo-title-input"]', "Task 1")
-        page.fill('[data-testid="todo-description-input"]', "First task")
-        page.click('[data-testid="create-todo-btn"]')
-        
-        page.fill('[data-testid="todo-title-input"]', "Task 2")
-        page.fill('[data-testid="todo-description-input"]', "Second task")
-        page.click('[data-testid="create-todo-btn"]')
+        seed_todos(("Task 1", "First task"), ("Task 2", "Second task"))
         
         # Mark first todo as completed
-        page.click('[data-testid="toggle-1"]')
+        page.get_by_test_id("toggle-1").click()
         
         # Edit second todo
-        page.click('[data-testid="edit-2"]')
-        page.fill('[data-testid="edit-title-2"]', "Updated Task 2")
-        page.click('[data-testid="save-edit-2"]')
+        page.get_by_test_id("edit-2").click()
+        page.get_by_test_id("edit-title-2").fill("Updated Task 2")
+        page.get_by_test_id("save-edit-2").click()
         
         # Check states
-        expect(page.locator('[data-testid="toggle-1"]')).to_be_checked()
-        expect(page.locator('[data-testid="title-2"]')).to_contain_text("Updated Task 2")
+        expect(page.get_by_test_id("toggle-1")).to_be_checked()
+        expect(page.get_by_test_id("title-2")).to_contain_text("Updated Task 2")
         
         # Check badge counts
         expect(page.locator("text=1 Pending")).to_be_visible()
         expect(page.locator("text=1 Done")).to_be_visible()
         
         # Delete completed todo
-        page.click('[data-testid="delete-1"]')
+        page.get_by_test_id("delete-1").click()
         
         # Only second todo should remain
-        expect(page.locator('[data-testid="todo-1"]')).not_to_be_visible()
-        expect(page.locator('[data-testid="todo-2"]')).to_be_visible()
+        expect(page.get_by_test_id("todo-1")).not_to_be_visible()
+        expect(page.get_by_test_id("todo-2")).to_be_visible()
         expect(page.locator("text=1 Pending")).to_be_visible()
         expect(page.locator("text=0 Done")).to_be_visible()
 
@@ -3,79 +3,143 @@
 Unified test runner that executes both backend unit tests and E2E tests
 Each test suite runs in isolation with separate databases and ports
 """
+import argparse
+import importlib.util
+import queue
 import subprocess
 import sys
 import os
 import tempfile
+import threading
 from pathlib import Path
 
-def run_command(cmd, cwd=None, description=""):
-    """Run a command and return success status"""
+# Every xdist worker starts its own backend and builds its own frontend bundle,
+# so beyond a couple of workers startup outweighs the gain for this suite
+E2E_WORKERS = 2
+
+PROJECT_ROOT = Path(__file__).parent
+BACKEND_DIR = PROJECT_ROOT / "backend"
+E2E_DIR = PROJECT_ROOT / "e2e"
+
+BACKEND_COMMAND = ["python3", "-m", "pytest", "test_api.py", "-v", "--tb=short"]
+
+def e2e_command():
+    """E2E core workflow tests, spread over xdist workers when it is installed"""
+    # Default load distribution: --dist=loadscope would keep the whole
+    # TestTodoAppE2E class, i.e. every test, on a single worker
+    xdist_args = []
+    if importlib.util.find_spec("xdist"):
+        xdist_args = ["-n", str(E2E_WORKERS)]
+    return ["python3", "-m", "pytest", "test_todo_e2e.py::TestTodoAppE2E::test_app_title", 
+            "test_todo_e2e.py::TestTodoAppE2E::test_create_todo",
+            "test_todo_e2e.py::TestTodoAppE2E::test_toggle_todo_completion",
+            "test_todo_e2e.py::TestTodoAppE2E::test_delete_todo",
+            "test_todo_e2e.py::TestTodoAppE2E::test_complex_workflow",
+            "-v", "--tb=short", *xdist_args]
+
+def run_single(phase):
+    """Replace this process with one phase's pytest, so its output and exit code pass straight through"""
+    cmd, cwd = {"backend": (BACKEND_COMMAND, BACKEND_DIR), "e2e": (e2e_command(), E2E_DIR)}[phase]
+    os.chdir(cwd)
+    os.execvp(cmd[0], cmd)
+
+def launch(cmd, cwd, description, output):
+    """Start a test phase and stream its output lines, tagged, into the shared queue"""
+    # pytest sees a pipe rather than a TTY, so ask for colour explicitly when
+    # this runner is on a terminal
+    if sys.stdout.isatty():
+        cmd = [*cmd, "--color=yes"]
     print(f"\n{'='*60}")
-    print(f"🏃 Running: {description}")
+    print(f"🏃 Starting: {description}")
     print(f"Command: {' '.join(cmd)}")
     print(f"Working directory: {cwd or os.getcwd()}")
     print(f"{'='*60}")
     
     try:
-        result = subprocess.run(
+        process = subprocess.Popen(
             cmd,
             cwd=cwd,
-            check=True,
-            capture_output=False,  # Show output in real-time
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,  # Line-buffered reads on our side of the pipe
+            # Otherwise the child block-buffers its writes into the pipe and
+            # lines arrive in bursts instead of as each test finishes
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
         )
-        print(f"✅ {description} - PASSED")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} - FAILED with exit code {e.returncode}")
-        return False
     except Exception as e:
         print(f"❌ {description} - ERROR: {e}")
+        output.put((description, None))
+        return None
+    
+    def pump():
+        for line in process.stdout:
+            output.put((description, line))
+        output.put((description, None))  # End of this phase's output
+    
+    threading.Thread(target=pump, daemon=True).start()
+    return process
+
+def wait_for(process, description):
+    """Wait for a launched phase and return success status"""
+    if process is None:
         return False
+    returncode = process.wait()
+    if returncode == 0:
+        print(f"✅ {description} - PASSED")
+        return True
+    print(f"❌ {description} - FAILED with exit code {returncode}")
+    return False
 
 def main():
     """Main test runner"""
-    project_root = Path(__file__).parent
-    backend_dir = project_root / "backend"
-    e2e_dir = project_root / "e2e"
-    
     print("🧪 Todo List App - Comprehensive Test Suite")
     print("="*60)
     print("This will run all tests in isolated environments:")
     print("• Backend unit tests (in-memory database)")
-    print("• E2E tests (separate test database + ports 8001/5174)")
+    print("• E2E tests (separate test database + ports 8001/5175 per worker)")
     print("="*60)
     
     results = []
+    output = queue.Queue()
+    
+    # Both phases use their own databases and ports, so they run side by side:
+    # the backend suite finishes while the E2E services are still starting
     
     # 1. Backend Unit Tests
     print("\n📋 Phase 1: Backend Unit Tests")
     print("Uses in-memory SQLite database for complete isolation")
     
-    backend_success = run_command(
-        ["python3", "-m", "pytest", "test_api.py", "-v", "--tb=short"],
-        cwd=backend_dir,
-        description="Backend Unit Tests"
+    backend_process = launch(
+        BACKEND_COMMAND,
+        cwd=BACKEND_DIR,
+        description="Backend Unit Tests",
+        output=output
     )
-    results.append(("Backend Unit Tests", backend_success))
     
     # 2. E2E Tests (with auto-spawned services)
     print("\n🌐 Phase 2: End-to-End Tests")
-    print("Spawns isolated test services on ports 8001 (backend) and 5174 (frontend)")
+    print("Spawns isolated test services per worker from ports 8001 (backend) and 5175 (frontend)")
     print("Uses separate test database in temp directory")
     
-    e2e_success = run_command(
-        ["python3", "-m", "pytest", "test_todo_e2e.py::TestTodoAppE2E::test_app_title", 
-         "test_todo_e2e.py::TestTodoAppE2E::test_create_todo",
-         "test_todo_e2e.py::TestTodoAppE2E::test_toggle_todo_completion",
-         "test_todo_e2e.py::TestTodoAppE2E::test_delete_todo",
-         "test_todo_e2e.py::TestTodoAppE2E::test_complex_workflow",
-         "-v", "--tb=short"],
-        cwd=e2e_dir,
-        description="End-to-End Tests (Core Workflows)"
+    e2e_process = launch(
+        e2e_command(),
+        cwd=E2E_DIR,
+        description="End-to-End Tests (Core Workflows)",
+        output=output
     )
-    results.append(("End-to-End Tests", e2e_success))
+    
+    # Show output as it arrives, tagged with its phase, until both have finished
+    running = 2
+    while running:
+        description, line = output.get()
+        if line is None:
+            running -= 1
+        else:
+            print(f"[{description}] {line}", end="")
+    
+    results.append(("Backend Unit Tests", wait_for(backend_process, "Backend Unit Tests")))
+    results.append(("End-to-End Tests", wait_for(e2e_process, "End-to-End Tests (Core Workflows)")))
     
     # Results Summary
     print("\n" + "="*60)
@@ -99,4 +163,10 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the backend and E2E test suites")
+    parser.add_argument("--single", choices=["backend", "e2e"],
+                        help="run only one phase, handing the process over to pytest")
+    args = parser.parse_args()
+    if args.single:
+        run_single(args.single)
     sys.exit(main())
\ No newline at end of file
@@ -14,6 +14,13 @@ def backend(ctx):
         ctx.run("uvicorn main:app --reload --host 0.0.0.0 --port 8000")
 
 
+@task
+def init_db(ctx):
+    """Create the database schema (production servers don't do it on startup)"""
+    with ctx.cd("backend"):
+        ctx.run("python3 init_db.py")
+
+
 @task
 def frontend(ctx):
     """Run the React frontend development server"""
@@ -37,11 +44,11 @@ def test_e2e(ctx):
 
 @task
 def test_all(ctx):
-    """Run all tests (API + E2E)"""
-    print("Running backend API tests...")
-    test_api(ctx)
-    print("\nRunning E2E tests...")
-    test_e2e(ctx)
+    """Run all tests (API + E2E) in a single pytest session"""
+    # Only one config file applies per session: e2e/pyproject.toml carries the
+    # Playwright options and markers, and the API tests need nothing of their own
+    ctx.run("python3 -m pytest -c e2e/pyproject.toml --rootdir . "
+            "backend/test_api.py e2e/test_todo_e2e.py -v --tb=short")
 
 
 @task